@@ -1,28 +1,44 @@
 """Configuration file for pytest."""
 
-import base64
-import json
+import binascii
+import functools
 import os
 import shutil
+from io import BytesIO
 from pathlib import Path
+from typing import TYPE_CHECKING
 from typing import Any
 from typing import Dict
 from typing import Generator
 from typing import Tuple
 
+import orjson
 import pytest
-from flask import Flask
-from PIL import Image
+import requests
+from requests.adapters import HTTPAdapter
 from selenium.webdriver.common.keys import Keys
-from werkzeug.datastructures import FileStorage
 
 from tests.server import TEST_SERVER_INFO
 from tests.server import build_flask_app
 from tests.server import run_threaded_flask_app
 
 
+# flask/werkzeug are imported where used (schema-only runs skip them)
+if TYPE_CHECKING:
+    from flask import Flask
+    from flask.testing import FlaskClient
+    from werkzeug.datastructures import FileStorage
+
+
+DUMMY_TXT_FILE_CONTENT = b"This is a test file."
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+WEBSITE_FILES = ("index.html", "config.json", "styles", "scripts")
+SB_TEST_URL = "https://seleniumbase.io/realworld/login"
+
+
+@pytest.hookimpl(tryfirst=True)
 def pytest_configure(config):
-    """For configuring pytest with custom markers."""
+    """For configuring pytest with custom markers and browser defaults."""
     config.addinivalue_line("markers", "debug: custom marker for debugging tests.")
     config.addinivalue_line("markers", "feature: custom marker for form feature tests.")
     config.addinivalue_line("markers", "fixture: custom marker for fixture tests.")
@@ -30,6 +46,11 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "schema: custom marker for schema tests.")
     config.addinivalue_line("markers", "website: custom marker for website tests.")
 
+    # new headless Chrome without images, unless a visible browser was asked for
+    if not config.getoption("headed", default=False):
+        config.option.headless2 = True
+        config.option.block_images = True
+
 
 def get_server_info() -> Tuple[int, str]:
     """Convenience function to get test server port and submit route."""
@@ -53,51 +74,58 @@ def base_custom_config() -> Dict[str, Any]:
     }
 
 
+def link_or_copy(src: str, dst: str) -> None:
+    """Hardlink a file, falling back to a real copy across filesystems."""
+    try:
+        # metadata only clone (no file contents are read or written)
+        os.link(src, dst)
+
+    except OSError:
+        # different filesystem (or links unsupported) so copy the bytes (sendfile)
+        shutil.copyfile(src, dst)
+
+
 def create_temp_websrc_dir(src: Path, dst: Path, src_files: Tuple[str, ...]) -> Path:
     """Create and populate a temporary directory with static web source files."""
     # create new destination subdir
     sub_dir = dst / "web_src"
     sub_dir.mkdir()
 
-    # copy each file or directory from the project directory to the temporary directory
+    # link each file or directory from the project directory to the temporary directory
     for item_name in src_files:
         # get the path to the source file or directory in the project directory
         source_item_path = src / item_name
 
         # check if directory
         if source_item_path.is_dir():
-            # if the item is a directory, recursively copy it
-            shutil.copytree(source_item_path, sub_dir / item_name)
+            # if the item is a directory, recursively link it
+            shutil.copytree(
+                source_item_path, sub_dir / item_name, copy_function=link_or_copy
+            )
 
         else:
-            # if the item is a file, copy it
-            shutil.copy(source_item_path, sub_dir)
+            # if the item is a file, link it
+            link_or_copy(str(source_item_path), str(sub_dir / item_name))
 
     return sub_dir
 
 
-def get_project_directory() -> Path:
-    """Get project directory path object."""
-    # Get the path of the current file (test_file.py)
-    current_file_path = Path(os.path.abspath(__file__))
-
-    # get grand parent dir
-    return current_file_path.parents[1]
-
-
 def load_config_file(directory: Path) -> Dict[str, Any]:
     """Load the JSON config file at directory."""
-    # open the config file in the project dir
-    with open(directory / "config.json", "r", encoding="utf-8") as config:
-        # load the JSON data into dict
-        return json.load(config)
+    # parse the raw bytes directly (no text decoding roundtrip)
+    return orjson.loads((directory / "config.json").read_bytes())
 
 
 def write_config_file(config: Dict[str, Any], src_path: Path) -> None:
     """Write out config.json file to source path."""
+    # get config path
+    config_path = src_path / "config.json"
+
+    # break any hardlink first so the linked source file is never overwritten
+    config_path.unlink(missing_ok=True)
+
     # writing dictionary to JSON file with pretty printing (2 spaces indentation)
-    with open(src_path / "config.json", "w") as json_file:
-        json.dump(config, json_file, indent=2)
+    config_path.write_bytes(orjson.dumps(config, option=orjson.OPT_INDENT_2))
 
 
 def prepare_default_config(config: Dict[str, Any]) -> Dict[str, Any]:
@@ -111,23 +139,40 @@ def prepare_default_config(config: Dict[str, Any]) -> Dict[str, Any]:
     # update ignore file uploads
     config["ignore_file_upload"] = False
 
-    # update input[type=file] accept attr
+    # update input[type=file] accept attr (adding custom section if missing)
     for question in config["questions"]:
-        # check type
         if question["type"] == "file":
-            # check for custom attr
-            if "custom" in question:
-                # only update accept attr
-                question["custom"]["accept"] = "*"
-
-            else:
-                # add custom section with accept attr
-                question["custom"] = {"accept": "*"}
+            question.setdefault("custom", {})["accept"] = "*"
 
     # get updated config data
     return config
 
 
+@functools.lru_cache(maxsize=1)
+def create_red_jpg_bytes() -> bytes:
+    """Encode a solid red JPEG image once per interpreter."""
+    # deferred so collection does not pay for importing PIL
+    from PIL import Image
+
+    # create a red image
+    image = Image.new("RGB", (100, 100), color="red")
+
+    # save it to an in-memory buffer
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG")
+
+    return buffer.getvalue()
+
+
+def build_data_url(file_content: bytes, mimetype: str) -> str:
+    """Encode file content as a base64 data URL."""
+    # encode the file content as base64
+    base64_content = binascii.b2a_base64(file_content, newline=False).decode("ascii")
+
+    # construct the data URL with the given MIME type
+    return f"data:{mimetype};base64,{base64_content}"
+
+
 @pytest.fixture(scope="session")
 def session_tmp_dir(tmp_path_factory) -> Path:
     """Uses temporary path factory to create a session-scoped temp path."""
@@ -146,31 +191,34 @@ def dummy_txt_file_path(tmp_path) -> Path:
     file_path = tmpdir / "test_file.txt"
 
     # write content to the file
-    with open(file_path, "w") as f:
-        f.write("This is a test file.")
+    file_path.write_bytes(DUMMY_TXT_FILE_CONTENT)
 
     return file_path
 
 
 @pytest.fixture(scope="function")
-def dummy_txt_file_stream(dummy_txt_file_path) -> FileStorage:
+def dummy_txt_file_stream(
+    dummy_txt_file_path,
+) -> Generator["FileStorage", None, None]:
     """Create a Flask FileStorage object from text file."""
-    # create a FileStorage object
-    return FileStorage(stream=open(dummy_txt_file_path, "rb"), filename="test_file.txt")
+    from werkzeug.datastructures import FileStorage
 
+    # create an in-memory FileStorage object (no dangling file handle)
+    file_storage = FileStorage(
+        stream=BytesIO(dummy_txt_file_path.read_bytes()), filename="test_file.txt"
+    )
 
-@pytest.fixture(scope="function")
-def dummy_txt_file_data_url(dummy_txt_file_path) -> str:
-    """Create a data URL for the dummy text file."""
-    # read the content of the file
-    with open(dummy_txt_file_path, "rb") as f:
-        file_content = f.read()
+    # provide the file storage to the test function
+    yield file_storage
+
+    # release the underlying stream
+    file_storage.close()
 
-    # encode the file content as base64
-    base64_content = base64.b64encode(file_content).decode("utf-8")
 
-    # construct the data URL with the appropriate MIME type
-    return f"data:text/plain;base64,{base64_content}"
+@pytest.fixture(scope="session")
+def dummy_txt_file_data_url() -> str:
+    """Create a data URL for the (constant) dummy text file content."""
+    return build_data_url(DUMMY_TXT_FILE_CONTENT, "text/plain")
 
 
 @pytest.fixture(scope="function")
@@ -191,26 +239,17 @@ def dummy_jpg_file_path(tmp_path: Path) -> Path:
     img_dir = tmp_path / "images"
     img_dir.mkdir()
 
-    # create a dummy image
+    # write out the dummy image
     img_path = img_dir / "dummy_image.jpg"
-    image = Image.new("RGB", (100, 100), color="red")  # create a red image
-    image.save(img_path)
+    img_path.write_bytes(create_red_jpg_bytes())
 
     return img_path
 
 
-@pytest.fixture(scope="function")
-def dummy_jpg_data_url(dummy_jpg_file_path) -> str:
-    """Create a data URL for the dummy JPEG file."""
-    # read the content of the file
-    with open(dummy_jpg_file_path, "rb") as f:
-        file_content = f.read()
-
-    # encode the file content as base64
-    base64_content = base64.b64encode(file_content).decode("utf-8")
-
-    # construct the data URL with the appropriate MIME type
-    return f"data:image/jpeg;base64,{base64_content}"
+@pytest.fixture(scope="session")
+def dummy_jpg_data_url() -> str:
+    """Create a data URL for the dummy JPEG file (from the in-memory bytes)."""
+    return build_data_url(create_red_jpg_bytes(), "image/jpeg")
 
 
 @pytest.fixture(scope="function")
@@ -241,20 +280,50 @@ def dummy_form_inputs(
 @pytest.fixture(scope="session")
 def sb_test_url() -> str:
     """Simply defines the test URL for seleniumbase fixture testing."""
-    return "https://seleniumbase.io/realworld/login"
+    return SB_TEST_URL
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
+def http_session() -> Generator[requests.Session, None, None]:
+    """Create a session-scoped HTTP session that pools outbound connections."""
+    # mount a pooling adapter (with retries) for all https requests
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=3)
+    session.mount("https://", adapter)
+
+    # provide the session to the test function
+    yield session
+
+    # close any pooled connections
+    session.close()
+
+
+@pytest.fixture(scope="session")
+def sb_domain_reachable(http_session: requests.Session, sb_test_url: str) -> bool:
+    """Probe the seleniumbase test URL once per session (with a short timeout)."""
+    # attempt to reach domain
+    try:
+        # only the status line and headers are needed (body is never read)
+        with http_session.get(sb_test_url, timeout=5, stream=True) as response:
+            # check status code is 200
+            return response.status_code == 200
+
+    except requests.RequestException:
+        # failed to reach (or timed out)
+        return False
+
+
+@pytest.fixture(scope="session")
 def project_dir() -> Path:
     """Get the path of the project directory."""
-    return get_project_directory()
+    return PROJECT_DIR
 
 
 @pytest.fixture(scope="session")
 def website_files() -> Tuple[str, ...]:
     """Declare the files necessary for serving the website."""
     # define the files and directories to copy from the project directory
-    return ("index.html", "config.json", "styles", "scripts")
+    return WEBSITE_FILES
 
 
 @pytest.fixture(scope="session")
@@ -262,11 +331,8 @@ def session_websrc_tmp_dir(
     session_tmp_dir: Path, website_files: Tuple[str, ...]
 ) -> Generator[Path, None, None]:
     """Create a per-session copy of the website source code for editing."""
-    # project dir
-    project_dir = get_project_directory()
-
     # create a temporary directory
-    temp_dir = create_temp_websrc_dir(project_dir, session_tmp_dir, website_files)
+    temp_dir = create_temp_websrc_dir(PROJECT_DIR, session_tmp_dir, website_files)
 
     # get the default config
     default_config = load_config_file(temp_dir)
@@ -297,24 +363,33 @@ def updated_user_config(default_user_config: Dict[str, Any]) -> Dict[str, Any]:
 
 
 @pytest.fixture(scope="session")
-def session_web_app(session_websrc_tmp_dir: Path) -> Flask:
+def session_web_app(session_websrc_tmp_dir: Path) -> "Flask":
     """Create a session-scoped Flask app for testing with the website source."""
     # create app
     return build_flask_app(session_websrc_tmp_dir)
 
 
 @pytest.fixture(scope="session")
-def live_session_web_app_url(session_web_app: Flask) -> str:
+def session_test_client(session_web_app: "Flask") -> "FlaskClient":
+    """Create a session-scoped test client (only for tests that leave no cookies)."""
+    return session_web_app.test_client()
+
+
+@pytest.fixture(scope="session")
+def live_session_web_app_url(session_web_app: "Flask") -> Generator[str, None, None]:
     """Runs session-scoped Flask app in a thread."""
     # get port
     port = session_web_app.config.get("PORT")
     assert port is not None
 
     # start threaded app
-    run_threaded_flask_app(session_web_app)
+    shutdown_server = run_threaded_flask_app(session_web_app)
+
+    # provide the url to the test function
+    yield f"http://localhost:{port}"
 
-    # get url
-    return f"http://localhost:{port}"
+    # stop the server at the end of the session
+    shutdown_server()
 
 
 @pytest.fixture(scope="function")
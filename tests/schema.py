@@ -4,32 +4,58 @@ import warnings
 from abc import ABC
 from abc import abstractmethod
 from collections import defaultdict
+from dataclasses import Field
 from dataclasses import dataclass
 from dataclasses import field
+from dataclasses import fields
+from typing import Any
+from typing import ClassVar
 from typing import Optional
 
 
 class Schema(ABC):
     """Base class for schema validation."""
 
+    # no instance __dict__ so the slotted dataclass subclasses stay lean
+    __slots__ = ()
+
+    # class level attrs set by @dataclass and get_type_checks respectively
+    __dataclass_fields__: ClassVar[dict[str, Field[Any]]]
+    _type_checks: ClassVar[tuple[tuple[str, Any], ...]]
+
     @abstractmethod
     def __post_init__(self):
         """Abstract method for validation."""
         pass
 
+    @classmethod
+    def get_type_checks(cls) -> tuple[tuple[str, Any], ...]:
+        """Get the field name and type pairs to validate (cached per class)."""
+        # only look at this class (never reuse a parent schema's table)
+        type_checks = cls.__dict__.get("_type_checks")
+
+        # build the table on first use
+        if type_checks is None:
+            type_checks = tuple((f.name, f.type) for f in fields(cls))
+            cls._type_checks = type_checks
+
+        return type_checks
+
     def validate_type(self):
         """Default implementation of type validation."""
-        for field_name, field_type in self.__annotations__.items():
-            if field_name in self.__dataclass_fields__:
-                actual_type = type(getattr(self, field_name))
-                if not issubclass(actual_type, field_type):
-                    raise TypeError(
-                        f"Expected {field_name:!r} to be of type "
-                        f"{field_type.__name__}, got {actual_type.__name__}"
-                    )
+        for field_name, field_type in self.get_type_checks():
+            value = getattr(self, field_name)
+            if not isinstance(value, field_type):
+                # plain classes read better by name (unions by their repr)
+                if isinstance(field_type, type):
+                    field_type = field_type.__name__
+                raise TypeError(
+                    f"Expected {field_name!r} to be of type "
+                    f"{field_type}, got {type(value).__name__}"
+                )
 
 
-@dataclass
+@dataclass(slots=True)
 class SelectBoxOptions(Schema):
     """Defines the selectbox options schema for config.json."""
 
@@ -44,7 +70,7 @@ class SelectBoxOptions(Schema):
         self.validate_type()
 
 
-@dataclass
+@dataclass(slots=True)
 class Question(Schema):
     """Defines the question schema for config.json."""
 
@@ -64,11 +90,7 @@ class Question(Schema):
         if self.type == "selectbox":
             if not self.options:
                 raise ValueError("Selectbox question must have options.")
-            validated_options = []
-            for option in self.options:
-                validated_option = SelectBoxOptions(**option)
-                validated_options.append(validated_option)
-            self.options = validated_options
+            self.options = [SelectBoxOptions(**option) for option in self.options]
         else:
             if self.options is not None:
                 warnings.warn(
@@ -79,18 +101,15 @@ class Question(Schema):
 
         # validate label
         if isinstance(self.label, list):
-            # loop through each string
-            valid_label = []
-            for line in self.label:
-                if not isinstance(line, str):
-                    raise ValueError("Label list only allows strings.")
-                valid_label.append(line)
+            # check each line is a string
+            if not all(isinstance(line, str) for line in self.label):
+                raise ValueError("Label list only allows strings.")
 
-            # now join all strings and update instructions
-            self.label = " ".join(valid_label)
+            # now join all strings and update label
+            self.label = " ".join(self.label)
 
 
-@dataclass
+@dataclass(slots=True)
 class Config(Schema):
     """Defines the schema for config.json."""
 
@@ -119,11 +138,8 @@ class Config(Schema):
 
     def validate_questions(self) -> None:
         """Run all necessary question validation checks."""
-        # validate questions
-        valid_questions = []
-        for question in self.questions:
-            # add question instance object
-            valid_questions.append(Question(**question))
+        # validate questions (new list so the caller's config is not mutated)
+        valid_questions = [Question(**question) for question in self.questions]
 
         # make sure questions name attrs unique
         self.check_unique_names(valid_questions)
@@ -152,15 +168,12 @@ class Config(Schema):
         """Check that instructions are correct if they are of type list."""
         # validate instructions
         if isinstance(self.instructions, list):
-            # loop through each string
-            valid_instructions = []
-            for line in self.instructions:
-                if not isinstance(line, str):
-                    raise ValueError("Instructions list only allows strings.")
-                valid_instructions.append(line)
+            # check each line is a string
+            if not all(isinstance(line, str) for line in self.instructions):
+                raise ValueError("Instructions list only allows strings.")
 
             # now join all strings and update instructions
-            self.instructions = " ".join(valid_instructions)
+            self.instructions = " ".join(self.instructions)
 
     def validate_form_target(self) -> None:
         """Make sure that the form target is set correctly."""
@@ -1,32 +1,33 @@
 """Defines functions related to the custom Flask testing server."""
 
-import base64
+import binascii
 import os
-import random
 import secrets
 import threading
 from pathlib import Path
+from typing import TYPE_CHECKING
 from typing import Any
+from typing import Callable
 from typing import Dict
-from typing import Generator
-from typing import Set
-
-from flask import Blueprint
-from flask import Flask
-from flask import jsonify
-from flask import render_template
-from flask import request
-from flask import send_from_directory
-from flask import session
-from werkzeug.datastructures import FileStorage
-from werkzeug.datastructures import ImmutableMultiDict
 
 from tests.data_structures import ImmutableDict
 
 
+# flask, waitress, etc. are imported where used (schema-only runs skip them)
+if TYPE_CHECKING:
+    from flask import Blueprint
+    from flask import Flask
+    from jinja2 import Template
+    from werkzeug.datastructures import FileStorage
+    from werkzeug.datastructures import ImmutableMultiDict
+
+
+# pytest-xdist worker number (gw0, gw1, ...) so parallel workers get their own port
+XDIST_WORKER_NUM = int(os.environ.get("PYTEST_XDIST_WORKER", "gw0").removeprefix("gw"))
+
 TEST_SERVER_INFO = ImmutableDict(
     {
-        "port": 5000,
+        "port": 5000 + XDIST_WORKER_NUM,
         "secret_key": secrets.token_hex(16),
         "submit_route": "/submit",
     }
@@ -34,64 +35,58 @@ TEST_SERVER_INFO = ImmutableDict(
 
 CONFIG_DATA_MAP: Dict[str, Any] = {}
 
+BASE64_CHUNK_SIZE = 57 * 1024
 
-def generate_unique_random_ports(num_ports: int) -> Generator[int, None, None]:
-    """Generator that only yield unique random ports."""
-    # create set of used ports
-    used_ports: Set[int] = set()
-
-    # loop over ports
-    while len(used_ports) < num_ports:
-        # get random port
-        port = random.randint(5001, 65535)
+STATIC_MAX_AGE = 60
 
-        # check it is unique
-        if port not in used_ports:
-            # send it forward
-            yield port
+HTML_TAG_TEMPLATES: Dict[str, str] = {
+    "image": "<img src={data_url!r}>",
+    "video": (
+        "<video controls>"
+        "    <source src={data_url!r} type={mimetype!r}>"
+        "    Your browser does not support the video tag."
+        "</video>"
+    ),
+    "audio": (
+        "<audio controls>"
+        "    <source src={data_url!r} type={mimetype!r}>"
+        "    Your browser does not support the audio tag."
+        "</audio>"
+    ),
+}
 
-            # mark it as used
-            used_ports.add(port)
+DEFAULT_HTML_TAG_TEMPLATE = "<a href={data_url!r}>Download {filename}</a>"
 
 
-def get_html_tag_from_mimetype(file: FileStorage, encoded_data: str) -> str:
+def get_html_tag_from_mimetype(file: "FileStorage", encoded_data: str) -> str:
     """Generate an HTML tag based on the MIME type of the file."""
     # create data URL for reuse below
     data_url = f"data:{file.mimetype};base64,{encoded_data}"
 
-    # match the mimetype
-    match file.mimetype.split("/")[0]:
-        case "image":
-            tag = f"<img src={data_url!r}>"
-        case "video":
-            tag = (
-                f"<video controls>"
-                f"    <source src={data_url!r} type={file.mimetype!r}>"
-                f"    Your browser does not support the video tag."
-                f"</video>"
-            )
-        case "audio":
-            tag = (
-                f"<audio controls>"
-                f"    <source src={data_url!r} type={file.mimetype!r}>"
-                f"    Your browser does not support the audio tag."
-                f"</audio>"
-            )
-        case _:
-            tag = f"<a href={data_url!r}>Download {file.filename}</a>"
-
-    return tag
-
-
-def process_form_data(form_data: ImmutableMultiDict) -> Dict[str, Any]:
+    # look up the tag template for the top-level MIME type
+    template = HTML_TAG_TEMPLATES.get(
+        file.mimetype.partition("/")[0], DEFAULT_HTML_TAG_TEMPLATE
+    )
+
+    return template.format(
+        data_url=data_url, mimetype=file.mimetype, filename=file.filename
+    )
+
+
+def process_form_data(form_data: "ImmutableMultiDict") -> Dict[str, Any]:
     """Process form data to handle multi-values."""
+    from flask import request
+
     # setup processed results
     processed_data: Dict[str, Any] = {}
 
+    # resolve the request proxy once (not per form field)
+    file_keys = set(request.files.keys())
+
     # check form key/values
     for key, value in form_data.items(multi=True):
         # check if key indicates file(s)
-        if key in request.files:
+        if key in file_keys:
             processed_data[key] = ""
 
         # check to see if there are multiple values
@@ -105,19 +100,37 @@ def process_form_data(form_data: ImmutableMultiDict) -> Dict[str, Any]:
     return processed_data
 
 
+def encode_file_base64(file: "FileStorage") -> str:
+    """Stream a file through the base64 encoder chunk by chunk."""
+    # encoded output buffer and bytes held back for the next 3 byte group
+    encoded = bytearray()
+    leftover = b""
+
+    # only whole 3 byte groups are encoded so a short read never pads mid-stream
+    while chunk := file.stream.read(BASE64_CHUNK_SIZE):
+        data = leftover + chunk
+        cut = len(data) - len(data) % 3
+        encoded += binascii.b2a_base64(data[:cut], newline=False)
+        leftover = data[cut:]
+
+    # encode (and pad) whatever remains at the end of the stream
+    encoded += binascii.b2a_base64(leftover, newline=False)
+
+    return encoded.decode("ascii")
+
+
 def process_uploaded_files(processed_data: Dict[str, Any]) -> None:
     """Process uploaded files and generate HTML tags."""
+    from flask import request
+
     # get list of tuples for key/files pairs
     for key, files in request.files.lists():
         # loop over each file
         for file in files:
             # make sure it exists
             if file.filename:
-                # get data from file
-                file_data = file.read()
-
                 # convert to base64 for data URL creation later ...
-                encoded_data = base64.b64encode(file_data).decode("utf-8")
+                encoded_data = encode_file_base64(file)
 
                 # create tag
                 tag = get_html_tag_from_mimetype(file, encoded_data)
@@ -131,8 +144,14 @@ def process_uploaded_files(processed_data: Dict[str, Any]) -> None:
 
 def create_main_blueprint(
     serve_directory: Path, config_data_map: Dict[str, Any]
-) -> Blueprint:
+) -> "Blueprint":
     """Builds a Flask Blueprint for all main routes."""
+    from flask import Blueprint
+    from flask import jsonify
+    from flask import request
+    from flask import send_from_directory
+    from flask import session
+
     main_bp = Blueprint("main", __name__)
 
     @main_bp.route("/")
@@ -164,27 +183,28 @@ def create_main_blueprint(
 
     @main_bp.route("/styles/<path:path>")
     def serve_styles(path):
-        """Send any CSS files from the temp dir."""
-        css_file = os.path.join("styles", path)
-        if os.path.exists(os.path.join(serve_directory, css_file)):
-            return send_from_directory(serve_directory, css_file)
-        else:
-            return "CSS file not found\n", 404
+        """Send any CSS files from the temp dir (404 if missing)."""
+        return send_from_directory(
+            serve_directory, f"styles/{path}", max_age=STATIC_MAX_AGE
+        )
 
     @main_bp.route("/scripts/<path:path>")
     def serve_scripts(path):
-        """Send any JavaScript files from the temp dir."""
-        js_file = os.path.join("scripts", path)
-        if os.path.exists(os.path.join(serve_directory, js_file)):
-            return send_from_directory(serve_directory, js_file)
-        else:
-            return "JavaScript file not found\n", 404
+        """Send any JavaScript files from the temp dir (404 if missing)."""
+        return send_from_directory(
+            serve_directory, f"scripts/{path}", max_age=STATIC_MAX_AGE
+        )
 
     return main_bp
 
 
-def create_config_blueprint(config_data_map: Dict[str, Any]) -> Blueprint:
+def create_config_blueprint(config_data_map: Dict[str, Any]) -> "Blueprint":
     """Builds a Flask Blueprint for all config updating routes."""
+    from flask import Blueprint
+    from flask import jsonify
+    from flask import request
+    from flask import session
+
     config_bp = Blueprint("config", __name__)
 
     @config_bp.route("/update_config", methods=["POST"])
@@ -209,8 +229,11 @@ def create_config_blueprint(config_data_map: Dict[str, Any]) -> Blueprint:
     return config_bp
 
 
-def create_submit_blueprint() -> Blueprint:
+def create_submit_blueprint(response_template: "Template") -> "Blueprint":
     """Builds a Flask Blueprint for all form submission routes."""
+    from flask import Blueprint
+    from flask import request
+
     submit_bp = Blueprint("submit", __name__)
 
     @submit_bp.route(TEST_SERVER_INFO["submit_route"], methods=["POST"])
@@ -228,13 +251,15 @@ def create_submit_blueprint() -> Blueprint:
         print(f"Added uploaded files: {request.files}")
 
         # render the contact form response
-        return render_template("form_response_template.html", form_data=processed_data)
+        return response_template.render(form_data=processed_data)
 
     return submit_bp
 
 
-def build_flask_app(serve_directory: Path) -> Flask:
+def build_flask_app(serve_directory: Path) -> "Flask":
     """Assembles Flask app to serve static site."""
+    from flask import Flask
+
     # get instance
     app = Flask(__name__)
 
@@ -247,10 +272,13 @@ def build_flask_app(serve_directory: Path) -> Flask:
     # set up config data map
     config_data_map = CONFIG_DATA_MAP
 
+    # compile the form response template once (not on every submission)
+    response_template = app.jinja_env.get_template("form_response_template.html")
+
     # build blueprints
     main_bp = create_main_blueprint(serve_directory, config_data_map)
     config_bp = create_config_blueprint(config_data_map)
-    submit_bp = create_submit_blueprint()
+    submit_bp = create_submit_blueprint(response_template)
 
     # add blueprints to Flask app
     app.register_blueprint(main_bp)
@@ -260,9 +288,34 @@ def build_flask_app(serve_directory: Path) -> Flask:
     return app
 
 
-def run_threaded_flask_app(app: Flask) -> None:
-    """Run a Flask app using threading."""
+def run_threaded_flask_app(app: "Flask") -> Callable[[], None]:
+    """Run a Flask app on a multithreaded WSGI server and return its shutdown."""
+    from waitress import wasyncore
+    from waitress.server import create_server
+
+    # the server registers its listening socket and connections in this map
+    socket_map: Dict[int, Any] = {}
+
+    # bind the listening socket now so the server is ready before returning
+    # (worker threads let asset fetches and submits overlap)
+    server = create_server(
+        app, map=socket_map, host="127.0.0.1", port=app.config["PORT"], threads=8
+    )
+
     # launch Flask app for project dir in thread
-    thread = threading.Thread(target=app.run)
+    thread = threading.Thread(target=server.run)
     thread.daemon = True
     thread.start()
+
+    def shutdown() -> None:
+        """Stop the workers and close every socket (frees the port)."""
+        # let in-flight requests finish
+        server.task_dispatcher.shutdown()
+
+        # close listener and any kept-alive connections (ends the server loop)
+        wasyncore.close_all(socket_map)
+
+        # wait for the server thread to exit
+        thread.join(timeout=5)
+
+    return shutdown
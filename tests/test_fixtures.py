@@ -1,28 +1,50 @@
 """Test the fixtures used in the tests."""
 
-import json
+import base64
+import os
+from io import BytesIO
 from pathlib import Path
 from typing import Any
 from typing import Dict
 from typing import Tuple
 
+import lxml.html
+import orjson
 import pytest
 from bs4 import BeautifulSoup
 from flask import Flask
+from flask.testing import FlaskClient
 from seleniumbase import BaseCase
+from werkzeug.datastructures import FileStorage
 
 from tests.conftest import load_config_file
 from tests.schema import check_config_schema
+from tests.server import BASE64_CHUNK_SIZE
+from tests.server import encode_file_base64
 
 
 def check_files_subset(source_dir: Path, webfiles: Tuple[str, ...]) -> bool:
     """Check if subset of files is found in another directory."""
-    # create sets
-    source_dir_set = set([str(entry.name) for entry in source_dir.iterdir()])
-    webfiles_set = set(webfiles)
+    # names still to be found
+    needed = set(webfiles)
 
-    # check subset
-    return webfiles_set.issubset(source_dir_set)
+    # scan lazily (stop as soon as every web file has been seen)
+    with os.scandir(source_dir) as entries:
+        for entry in entries:
+            needed.discard(entry.name)
+            if not needed:
+                return True
+
+    # check subset (also covers an empty webfiles tuple)
+    return not needed
+
+
+class ShortReadStream(BytesIO):
+    """Byte stream that returns fewer bytes than requested (like a socket)."""
+
+    def read(self, size: Any = -1) -> bytes:
+        """Read at most a little under half of the requested bytes."""
+        return super().read(size if size is None or size < 0 else size // 2 - 1)
 
 
 @pytest.mark.fixture
@@ -47,10 +69,10 @@ def test_config_keys_in_form_inputs(
 ) -> None:
     """Check that keys from config.json are present in form input testing fixture."""
     # get types from questions section of config.json
-    question_types = [q["type"] for q in default_user_config["questions"]]
+    question_types = {q["type"] for q in default_user_config["questions"]}
 
     # check config question types missing form inputs (if any)
-    missing_keys = set(question_types) - set(dummy_form_inputs)
+    missing_keys = question_types - dummy_form_inputs.keys()
 
     # no missing keys
     assert (
@@ -80,88 +102,61 @@ def test_hello_world_sb(sb: BaseCase, sb_test_url: str) -> None:
 
 @pytest.mark.flask
 @pytest.mark.fixture
-def test_index_route(session_web_app: Flask) -> None:
-    """Test the index route."""
-    client = session_web_app.test_client()
-    response = client.get("/")
-    assert response.status_code == 200
-
-
-@pytest.mark.flask
-@pytest.mark.fixture
-def test_other_root_files_route(session_web_app: Flask) -> None:
-    """Test the route for serving other root files."""
-    client = session_web_app.test_client()
-    response = client.get("/config.json")
-    assert response.status_code == 200
-
-
-@pytest.mark.flask
-@pytest.mark.fixture
-def test_serve_styles_route(session_web_app: Flask) -> None:
-    """Test the route for serving CSS files."""
-    client = session_web_app.test_client()
-    response = client.get("/styles/form.css")
-    assert response.status_code == 200
-
-
-@pytest.mark.flask
-@pytest.mark.fixture
-def test_serve_scripts_route(session_web_app: Flask) -> None:
-    """Test the route for serving JavaScript files."""
-    client = session_web_app.test_client()
-    response = client.get("/scripts/form.js")
+@pytest.mark.parametrize(
+    "path",
+    [
+        pytest.param("/", id="index"),
+        pytest.param("/config.json", id="other_root_files"),
+        pytest.param("/styles/form.css", id="serve_styles"),
+        pytest.param("/scripts/form.js", id="serve_scripts"),
+    ],
+)
+def test_static_routes(session_test_client: FlaskClient, path: str) -> None:
+    """Test the routes serving the index, root, CSS and JavaScript files."""
+    response = session_test_client.get(path)
     assert response.status_code == 200
 
 
 @pytest.mark.flask
 @pytest.mark.fixture
 def test_submit_form_route(
-    session_web_app: Flask,
+    session_test_client: FlaskClient,
     dummy_form_post_data: Dict[str, Any],
     dummy_txt_file_data_url: str,
 ) -> None:
     """Test the route for submitting a form."""
-    # get client
-    client = session_web_app.test_client()
-
     # submit response
-    response = client.post(
+    response = session_test_client.post(
         "/submit", data=dummy_form_post_data, content_type="multipart/form-data"
     )
 
     # assert that the response status code is 200 (OK)
     assert response.status_code == 200
 
-    # get content
-    content = response.data.decode("utf-8")
+    # parse the HTML response (once, with lxml)
+    tree = lxml.html.fromstring(response.data)
 
     # check response html header
-    assert "Contact Form Response" in content
-
-    # parse the HTML response
-    soup = BeautifulSoup(response.data, "html.parser")
+    assert "Contact Form Response" in tree.findtext(".//title", default="")
 
     # find the container div
-    container = soup.find("div", class_="container")
-    assert container is not None, "Container div not found in HTML response"
+    containers = tree.xpath("//div[@class='container']")
+    assert containers, "Container div not found in HTML response"
 
     # find and extract form data from the HTML
     form_data = {}
-    labels = container.find_all("label")
-    for label in labels:
-        key = label["for"]
-        # find the <p> tag associated with the label
-        p_tag = label.find_next_sibling("p")
-        if p_tag:
-            # find the <a> tag within the <p> tag
-            a_tag = p_tag.find("a")
-            if a_tag:
-                # extract the value of the "href" attribute from the <a> tag
-                value = a_tag.get("href")
+    for label in containers[0].iterfind("label"):
+        key = label.get("for")
+        # the <p> tag associated with the label is its next sibling
+        p_tag = label.getnext()
+        if p_tag is not None and p_tag.tag == "p":
+            # extract the "href" attribute of any <a> tag within the <p> tag
+            hrefs = p_tag.xpath(".//a/@href")
+            if hrefs:
+                value = hrefs[0]
             else:
-                # if <a> tag is not found, set value to None
-                value = " ".join(p_tag.stripped_strings)
+                # if <a> tag is not found, use the stripped text
+                value = " ".join(t.strip() for t in p_tag.itertext() if t.strip())
             form_data[key] = value
 
     # define expected form data
@@ -179,6 +174,48 @@ def test_submit_form_route(
         ), "Form data in HTML response does not match expected form data"
 
 
+@pytest.mark.flask
+@pytest.mark.fixture
+def test_submit_large_file_route(session_test_client: FlaskClient) -> None:
+    """Test a file spanning several base64 chunks is encoded correctly."""
+    # file content larger than two encoder chunks (and not a multiple of 3)
+    file_content = os.urandom(2 * BASE64_CHUNK_SIZE + 1)
+
+    # submit response
+    response = session_test_client.post(
+        "/submit",
+        data={"big_file": (BytesIO(file_content), "big_file.bin")},
+        content_type="multipart/form-data",
+    )
+
+    # assert that the response status code is 200 (OK)
+    assert response.status_code == 200
+
+    # get the data URL from the download link
+    tree = lxml.html.fromstring(response.data)
+    hrefs = tree.xpath("//label[@for='big_file']/following-sibling::p[1]//a/@href")
+    assert hrefs, "Download link not found in HTML response"
+
+    # compare with a one-shot encode of the whole file
+    _, _, encoded_data = hrefs[0].partition(";base64,")
+    assert encoded_data == base64.b64encode(file_content).decode("ascii")
+
+
+@pytest.mark.flask
+@pytest.mark.fixture
+@pytest.mark.parametrize(
+    "size", [0, 1, 2, BASE64_CHUNK_SIZE - 1, BASE64_CHUNK_SIZE + 1, 200_001]
+)
+def test_encode_file_base64_short_reads(size: int) -> None:
+    """Test short stream reads never insert padding in the middle of the data."""
+    # file whose stream returns fewer bytes than asked for on every read
+    file_content = os.urandom(size)
+    file = FileStorage(stream=ShortReadStream(file_content), filename="file.bin")
+
+    # compare with a one-shot encode of the whole file
+    assert encode_file_base64(file) == base64.b64encode(file_content).decode("ascii")
+
+
 @pytest.mark.flask
 @pytest.mark.fixture
 def test_update_config_route(session_web_app: Flask) -> None:
@@ -206,7 +243,7 @@ def test_update_config_route(session_web_app: Flask) -> None:
     assert get_response.status_code == 200
 
     # check the response content to verify the updated config data
-    config_data = json.loads(get_response.data)
+    config_data = orjson.loads(get_response.data)
     assert config_data == new_config
 
 
@@ -218,7 +255,7 @@ def test_reset_config_route(session_web_app: Flask) -> None:
 
     # store original config data
     old_config_data_response = client.get("/config.json")
-    old_config_data = json.loads(old_config_data_response.data)
+    old_config_data = orjson.loads(old_config_data_response.data)
 
     # send a POST request with JSON data to update the configuration
     new_config = {"key": "value"}
@@ -234,7 +271,7 @@ def test_reset_config_route(session_web_app: Flask) -> None:
     assert get_response.status_code == 200
 
     # check the response content to verify the updated config data
-    config_data = json.loads(get_response.data)
+    config_data = orjson.loads(get_response.data)
     assert config_data == new_config
 
     # send a GET request to reset the configuration
@@ -250,7 +287,7 @@ def test_reset_config_route(session_web_app: Flask) -> None:
     assert reset_config_response.status_code == 200
 
     # check the response content to verify the reset config data
-    reset_config_data = json.loads(reset_config_response.data)
+    reset_config_data = orjson.loads(reset_config_response.data)
     assert reset_config_data == old_config_data
 
 
@@ -264,21 +301,20 @@ def test_port_in_app_config(session_web_app: Flask) -> None:
 @pytest.mark.flask
 @pytest.mark.fixture
 def test_session_config_form_backend_updated(
-    session_websrc_tmp_dir: Path, session_web_app: Flask
+    session_websrc_tmp_dir: Path, session_test_client: FlaskClient
 ) -> None:
     """Make sure config file has been updated with url."""
     # load config file
     config = load_config_file(session_websrc_tmp_dir)
 
     # get config
-    client = session_web_app.test_client()
-    response = client.get("/config.json")
+    response = session_test_client.get("/config.json")
 
     # verify the response status code
     assert response.status_code == 200
 
     # convert the response content to JSON
-    json_data = json.loads(response.data)
+    json_data = orjson.loads(response.data)
 
     # check that key is in config
     key = "form_backend_url"
@@ -5,7 +5,6 @@ from typing import Dict
 from typing import Generator
 from typing import Tuple
 from typing import Type
-from typing import Union
 
 import pytest
 
@@ -32,41 +31,52 @@ def base_schema_check(
             _ = schema(**data)
 
 
-def selectbox_option_test_data() -> (
-    Generator[Tuple[Dict[str, Union[bool, str]], bool], None, None]
-):
-    """Generates all possible test data for testing selectbox options schema."""
+# all possible test data for testing selectbox options schema
+SELECTBOX_OPTION_TEST_DATA = (
     # valid selectbox option
-    yield {
-        "label": "Option 1",
-        "value": "option1",
-        "selected": True,
-        "disabled": False,
-    }, True
-
+    pytest.param(
+        {
+            "label": "Option 1",
+            "value": "option1",
+            "selected": True,
+            "disabled": False,
+        },
+        True,
+        id="valid_full",
+    ),
     # valid selectbox option with defaults
-    yield {"label": "Option 2", "value": "option2"}, True
-
+    pytest.param({"label": "Option 2", "value": "option2"}, True, id="valid_defaults"),
     # invalid selectbox option: wrong field types
-    yield {"label": "Option 3", "value": "option3", "selected": "true"}, False
-    yield {"label": "Option 4", "value": "option4", "disabled": "false"}, False
-
+    pytest.param(
+        {"label": "Option 3", "value": "option3", "selected": "true"},
+        False,
+        id="wrong_type_selected",
+    ),
+    pytest.param(
+        {"label": "Option 4", "value": "option4", "disabled": "false"},
+        False,
+        id="wrong_type_disabled",
+    ),
     # invalid selectbox option: missing required keys
-    yield {"label": "Option 5"}, False
-    yield {"value": "option6"}, False
-
+    pytest.param({"label": "Option 5"}, False, id="missing_value"),
+    pytest.param({"value": "option6"}, False, id="missing_label"),
     # invalid selectbox option: wrong key name
-    yield {"label": "Option 7", "val": "option7"}, False
-    yield {
-        "label": "Option 8",
-        "value": "option8",
-        "selected": True,
-        "disbled": False,
-    }, False
+    pytest.param({"label": "Option 7", "val": "option7"}, False, id="wrong_key_val"),
+    pytest.param(
+        {
+            "label": "Option 8",
+            "value": "option8",
+            "selected": True,
+            "disbled": False,
+        },
+        False,
+        id="wrong_key_disbled",
+    ),
+)
 
 
 @pytest.mark.schema
-@pytest.mark.parametrize("option_data, expected_result", selectbox_option_test_data())
+@pytest.mark.parametrize("option_data, expected_result", SELECTBOX_OPTION_TEST_DATA)
 def test_selectbox_option_schema_class(
     option_data: Dict[str, Any], expected_result: bool
 ) -> None:
@@ -1,5 +1,6 @@
 """Test all features of website."""
 
+import functools
 from datetime import datetime
 from difflib import SequenceMatcher
 from pathlib import Path
@@ -9,17 +10,41 @@ from typing import Generator
 from typing import List
 from typing import Optional
 from typing import Tuple
+from typing import Union
 
 import pytest
 import requests
 from bs4 import BeautifulSoup
+from bs4 import SoupStrainer
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
+from selenium.webdriver.support.ui import Select
 from seleniumbase import BaseCase
 
 from tests.schema import check_config_schema
 
 
+# script collecting (element, tag name, type) for each named form control and the
+# element for each button ID at once
+FORM_CONTROLS_SCRIPT = """
+const form = arguments[0];
+const controls = arguments[1].map((name) => {
+  const element = form.querySelector(`[name="${CSS.escape(name)}"]`);
+  return [element, element.tagName.toLowerCase(), element.type];
+});
+const buttons = arguments[2].map((id) => form.querySelector(`#${CSS.escape(id)}`));
+return [controls, buttons];
+"""
+
+# script setting a control's value and firing the events typing would have fired
+SET_VALUE_SCRIPT = """
+const element = arguments[0];
+element.value = arguments[1];
+element.dispatchEvent(new Event("input", { bubbles: true }));
+element.dispatchEvent(new Event("change", { bubbles: true }));
+"""
+
+
 def any_required_questions(questions: List[Dict[str, Any]]) -> bool:
     """Determines if any questions are required."""
     return any(q["required"] for q in questions)
@@ -51,13 +76,12 @@ def check_required_inputs_border_red(
             yield not color
 
 
-def read_html_file(file_path: Path) -> str:
-    """Open an HTML file and return contents as string."""
-    with open(file_path, "r") as file:
-        html_content = file.read()
-    return html_content
+def read_html_file(file_path: Union[str, Path]) -> bytes:
+    """Read an HTML file and return the raw (undecoded) contents."""
+    return Path(file_path).read_bytes()
 
 
+@functools.lru_cache(maxsize=64)
 def convert_to_isoformat(
     date: Optional[str] = None,
     time: Optional[str] = None,
@@ -100,68 +124,99 @@ def convert_to_isoformat(
 
 def select_options(question: Dict[str, Any]) -> str:
     """Chose selection from options."""
-    # count number of options NOT disabled
-    for option in question["options"]:
-        # check if disabled present
-        if option.get("disabled", False):
-            # skip disabled options
-            continue
+    # get the first option that is not disabled
+    sample_option = next(
+        (
+            option["value"]
+            for option in question["options"]
+            if not option.get("disabled", False)
+        ),
+        None,
+    )
 
-        else:
-            # end
-            break
+    # every option disabled means there is nothing to select
+    if sample_option is None:
+        raise ValueError(f"No enabled options for question {question['name']!r}.")
+
+    return sample_option
+
+
+def set_input_value(input_element: WebElement, value: str) -> None:
+    """Set an input's value in one WebDriver call instead of typing it out."""
+    input_element.parent.execute_script(SET_VALUE_SCRIPT, input_element, value)
+
+
+def prepare_form_inputs(
+    form_inputs: Dict[str, Any]
+) -> Dict[str, Tuple[Optional[Tuple[str, ...]], str]]:
+    """Map each input type to the keys to send and the value expected back."""
+    prepared: Dict[str, Tuple[Optional[Tuple[str, ...]], str]] = {}
+    for input_type, test_value in form_inputs.items():
+        # date/time inputs are typed in steps but submitted in ISO 8601 format
+        if isinstance(test_value, dict):
+            iso_value = convert_to_isoformat(**test_value)
+            prepared[input_type] = (tuple(test_value.values()), iso_value)
+
+        # file inputs are sent a path but submitted as a data URL
+        elif isinstance(test_value, tuple):
+            file_path, data_url = test_value
+            prepared[input_type] = ((file_path,), data_url)
 
-    # get the first valid option
-    return option["value"]
+        # everything else is set directly and submitted as is (skipping selectbox)
+        elif test_value is not None:
+            prepared[input_type] = (None, test_value)
+
+    return prepared
+
+
+def locate_form_controls(
+    form_element: WebElement,
+    config: Dict[str, Any],
+    button_ids: Tuple[str, ...] = (),
+) -> Tuple[List[List[Any]], List[WebElement]]:
+    """Get every question's control and the given buttons in one round trip."""
+    # get every question's element, tag and type (plus buttons) in one script call
+    question_names = [question["name"] for question in config["questions"]]
+    form_controls, buttons = form_element.parent.execute_script(
+        FORM_CONTROLS_SCRIPT, form_element, question_names, list(button_ids)
+    )
+    return form_controls, buttons
 
 
 def fill_out_form(
-    form_element: WebElement, config: Dict[str, Any], form_inputs: Dict[str, Any]
+    form_element: WebElement,
+    config: Dict[str, Any],
+    form_inputs: Dict[str, Any],
+    form_controls: Optional[List[List[Any]]] = None,
 ) -> Generator[Tuple[str, str], None, None]:
     """Programmatically fill out form and yield name/value pairs."""
-    # loop over questions
-    for question in config["questions"]:
-        # now get element with name
-        input_element = form_element.find_element(By.NAME, question["name"])
+    # resolve the keys/expected value for every input type once (not per question)
+    prepared_inputs = prepare_form_inputs(form_inputs)
 
-        # get tag element type
-        tag_name = input_element.tag_name.lower()
+    # locate the form controls unless the caller already has them
+    if form_controls is None:
+        form_controls, _ = locate_form_controls(form_element, config)
 
+    # loop over questions
+    for question, (input_element, tag_name, input_type) in zip(
+        config["questions"], form_controls, strict=True
+    ):
         # control flow for different types
         if tag_name == "input" or tag_name == "textarea":
-            # get the type
-            input_type = input_element.get_attribute("type")
-
             # check input_type
             assert input_type is not None
 
-            # get test value for input type
-            test_value = form_inputs[input_type]
-
-            # check if date/time dict
-            if isinstance(test_value, dict):
-                # now loop over multiple input steps
-                for sub_input in test_value.values():
-                    # send it
-                    input_element.send_keys(sub_input)
-
-                # now update test value
-                test_value = convert_to_isoformat(**test_value)
-
-            # check if file tuple
-            elif isinstance(test_value, tuple):
-                # unpack
-                file_path, data_url = test_value
-
-                # send file path
-                input_element.send_keys(file_path)
+            # get keys to send and expected value for input type
+            keys_to_send, test_value = prepared_inputs[input_type]
 
-                # update test value
-                test_value = data_url
+            # plain values are set in one call
+            if keys_to_send is None:
+                set_input_value(input_element, test_value)
 
+            # date/time steps and file paths still need real keystrokes
             else:
-                # just normal
-                input_element.send_keys(test_value)
+                for keys in keys_to_send:
+                    input_element.send_keys(keys)
 
             # generate
             yield question["name"], test_value
@@ -170,41 +225,34 @@ def fill_out_form(
             # get sample selection from options
             sample_option = select_options(question)
 
-            # find all option elements within the select element
-            option_elements = input_element.find_elements(By.TAG_NAME, "option")
-
-            # loop through the option elements and select the desired one
-            for option_element in option_elements:
-                # basically get first option that is not empty (i.e. a default)
-                if option_element.get_attribute("value") == sample_option:
-                    # click it ...
-                    option_element.click()
+            # select it (a fixed number of WebDriver calls, not a call per option)
+            Select(input_element).select_by_value(sample_option)
 
             # generate
             yield question["name"], sample_option
 
 
 def extract_received_form_input(
-    response_html: str,
+    response_html: Union[str, bytes],
 ) -> Generator[Tuple[str, str], None, None]:
     """Extract input received from form submission."""
-    # parse the HTML content with BeautifulSoup
-    soup = BeautifulSoup(response_html, "html.parser")
+    # parse only the container subtree (with the C backed lxml parser)
+    soup = BeautifulSoup(
+        response_html, "lxml", parse_only=SoupStrainer("div", class_="container")
+    )
 
     # find the container element
     container = soup.find("div", class_="container")
 
-    # find all label elements within the container
-    labels = container.find_all("label")
+    # find all labels and the value element directly following each one
+    labels = container.select("label")
+    value_elements = container.select("label + p")
 
-    # iterate over the labels to retrieve the key-value pairs
-    for label in labels:
+    # iterate over the label/value pairs
+    for label, value_element in zip(labels, value_elements, strict=True):
         # get label's "for" attribute as key
         key = label["for"]
 
-        # now find the value element
-        value_element = label.find_next_sibling("p")
-
         # check if sub elements exist within the <p> tag
         sub_elements = value_element.find_all(["a", "img", "video", "audio"])
 
@@ -413,19 +461,23 @@ def test_form_submission(
     # find the form element
     form_element = sb.get_element("form")
 
+    # get the form controls and send button together
+    form_controls, (send_button,) = locate_form_controls(
+        form_element, all_default_configs, ("send_button",)
+    )
+
     # fill out form
     submitted_input = {
         k: v
-        for k, v in fill_out_form(form_element, all_default_configs, dummy_form_inputs)
+        for k, v in fill_out_form(
+            form_element, all_default_configs, dummy_form_inputs, form_controls
+        )
     }
 
     # save screeshot for comfirmation of form entries
     sb.save_screenshot_to_logs()
 
-    # get send button ...
-    send_button = form_element.find_element(By.ID, "send_button")
-
-    # ... now click it
+    # now click the send button
     send_button.click()
 
     # check that the form was submitted
@@ -487,9 +539,6 @@ def test_form_submission_required_constraint(
     # get send button ...
     send_button = form_element.find_element(By.ID, "send_button")
 
-    # store page source before
-    page_source = {"before": sb.get_page_source()}
-
     # check for required questions
     required_questions_present = any_required_questions(
         all_default_configs["questions"]
@@ -502,17 +551,22 @@ def test_form_submission_required_constraint(
     if required_questions_present:
         sb.wait_for_and_accept_alert()
 
-    # now store it after
-    page_source["after"] = sb.get_page_source()
+        # only the form's markup is needed to check the required inputs
+        form_html = form_element.get_attribute("outerHTML")
+
+        # should see red outlined required questions
+        assert all(check_required_inputs_border_red(form_html))
 
-    # should see red outlined required questions
-    assert all(check_required_inputs_border_red(page_source["after"]))
+    else:
+        # nothing required so the form submits (and the form element goes stale)
+        sb.assert_text("Contact Form Response")
 
     # save screenshot for confirmation
     sb.save_screenshot_to_logs()
 
 
 @pytest.mark.website
+@pytest.mark.xdist_group("downloads")
 def test_form_download(
     sb: BaseCase,
     live_session_web_app_url: str,
@@ -543,11 +597,16 @@ def test_form_download(
         # find the form element
         form_element = sb.get_element("form")
 
+        # get the form controls and download button together
+        form_controls, (download_button,) = locate_form_controls(
+            form_element, all_default_configs, ("download_button",)
+        )
+
         # fill out form
         submitted_input = {
             k: v
             for k, v in fill_out_form(
-                form_element, all_default_configs, dummy_form_inputs
+                form_element, all_default_configs, dummy_form_inputs, form_controls
             )
         }
 
@@ -563,10 +622,7 @@ def test_form_download(
         # delete any previousl created downloads
         sb.delete_downloaded_file_if_present(f"{download_dir}/{dwnld_file}")
 
-        # get download button ...
-        download_button = form_element.find_element(By.ID, "download_button")
-
-        # ... now click it ...
+        # now click the download button ...
         download_button.click()
 
         # ... and make sure file is present in downloads dir
@@ -607,6 +663,7 @@ def test_form_download(
 
 
 @pytest.mark.website
+@pytest.mark.xdist_group("downloads")
 def test_form_download_required_constraint(
     sb: BaseCase,
     live_session_web_app_url: str,
@@ -639,9 +696,6 @@ def test_form_download_required_constraint(
         # get send button ...
         download_button = form_element.find_element(By.ID, "download_button")
 
-        # store page source before
-        page_source = {"before": sb.get_page_source()}
-
         # check for required questions
         required_questions_present = any_required_questions(
             all_default_configs["questions"]
@@ -654,11 +708,11 @@ def test_form_download_required_constraint(
         if required_questions_present:
             sb.wait_for_and_accept_alert()
 
-        # now store it after
-        page_source["after"] = sb.get_page_source()
+        # only the form's markup is needed to check the required inputs
+        form_html = form_element.get_attribute("outerHTML")
 
         # should see red outlined required questions
-        assert all(check_required_inputs_border_red(page_source["after"]))
+        assert all(check_required_inputs_border_red(form_html))
 
         # save screenshot for confirmation
         sb.save_screenshot_to_logs()
@@ -843,9 +897,6 @@ def test_select_default_submission_rejected(
     # get send button ...
     send_button = form_element.find_element(By.ID, "send_button")
 
-    # store page source before
-    page_source = {"before": sb.get_page_source()}
-
     # ... now click it
     send_button.click()
 
@@ -858,11 +909,8 @@ def test_select_default_submission_rejected(
     # make sure alert texts match
     assert alert_text == "Please fill out all required fields."
 
-    # now store it after
-    page_source["after"] = sb.get_page_source()
-
     # should NOT see contact form response
-    assert "Contact Form Response" not in page_source["after"]
+    sb.assert_text_not_visible("Contact Form Response")
 
     # get screenshot
     sb.save_screenshot_to_logs()